@@ -1,13 +1,31 @@
+import math
+import numpy as np
+import os
 import pygame
-import random
+import queue
 import sys
+import threading
+import time
+import warnings
+
+try:
+    from numba import njit
+except ImportError:  # Without Numba the step core runs as plain (slow) Python
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
-# Initialize Pygame
-pygame.init()
 
 # Constants
 WIDTH, HEIGHT = 400, 600
 FPS = 60
+PIPE_WIDTH = 70
+
+# State returned by step() once the game is over, shared and read-only
+_TERMINAL_STATE = np.zeros(5)
+_TERMINAL_STATE.flags.writeable = False
 
 # Colors
 WHITE = (255, 255, 255)
@@ -18,13 +36,36 @@ YELLOW = (255, 255, 0)
 
 
 class Bird:
-    def __init__(self):
-        self.x = 80
+    __slots__ = ("_state",)
+
+    # Shared by every bird
+    x = 80
+    gravity = 0.5
+    jump_strength = -10
+    size = 30
+
+    def __init__(self, state=None):
+        # y and velocity live in a float64 array, so a game can hand it (as a
+        # view of its world array) to the compiled step core
+        self._state = np.empty(2) if state is None else state
         self.y = HEIGHT // 2
         self.velocity = 0
-        self.gravity = 0.5
-        self.jump_strength = -10
-        self.size = 30
+
+    @property
+    def y(self):
+        return float(self._state[0])
+
+    @y.setter
+    def y(self, value):
+        self._state[0] = value
+
+    @property
+    def velocity(self):
+        return float(self._state[1])
+
+    @velocity.setter
+    def velocity(self, value):
+        self._state[1] = value
 
     def jump(self):
         self.velocity = self.jump_strength
@@ -34,203 +75,579 @@ class Bird:
         self.y += self.velocity
 
     def draw(self, screen):
-        pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), self.size // 2)
-
-    def get_rect(self):
-        return pygame.Rect(
-            self.x - self.size // 2, self.y - self.size // 2, self.size, self.size
+        return pygame.draw.circle(
+            screen, YELLOW, (int(self.x), int(self.y)), self.size // 2
         )
 
 
-class Pipe:
-    def __init__(self, x, gap=200):
-        self.x = x
-        self.width = 70
-        self.gap = gap
-        self.top_height = random.randint(100, HEIGHT - self.gap - 100)
-        self.speed = 3
-        self.passed = False
-
-    def update(self):
-        self.x -= self.speed
-
-    def draw(self, screen):
-        # Top pipe
-        pygame.draw.rect(screen, GREEN, (self.x, 0, self.width, self.top_height))
-        # Bottom pipe
-        pygame.draw.rect(
-            screen,
-            GREEN,
-            (
-                self.x,
-                self.top_height + self.gap,
-                self.width,
-                HEIGHT - self.top_height - self.gap,
-            ),
-        )
+def _max_pipes(pipe_distance):
+    """Most pipes that can be on screen at once"""
+    return int(math.ceil((WIDTH + PIPE_WIDTH) / pipe_distance)) + 1
+
+
+# A FlappyBirdGame keeps all of its state in one float64 "world" array, so a
+# step is a single call into the compiled core with a single argument. The
+# array starts with these fields, followed by the pipe ring buffers (x, top
+# height, passed flag, capacity slots each) and the pipe height pool.
+_LAYOUT = (
+    # Parameters, written on reset
+    "bird_x",
+    "bird_size",
+    "gravity",
+    "jump_strength",
+    "pipe_gap",
+    "pipe_distance",
+    "base_speed",
+    "speed_increase_rate",
+    "width",
+    "height",
+    "fps",
+    "pipe_width",
+    "capacity",
+    "pool_size",
+    # Game variables
+    "bird_y",
+    "bird_velocity",
+    "current_speed",
+    "frames_elapsed",
+    "score",
+    "pipe_head",
+    "pipe_count",
+    "next_pipe",
+    "height_idx",
+    # State returned by get_state()
+    "state_bird_y",
+    "state_bird_velocity",
+    "state_next_pipe_x",
+    "state_next_pipe_top",
+    "state_next_pipe_bottom",
+)
+(
+    _BIRD_X,
+    _BIRD_SIZE,
+    _GRAVITY,
+    _JUMP_STRENGTH,
+    _PIPE_GAP,
+    _PIPE_DISTANCE,
+    _BASE_SPEED,
+    _SPEED_INCREASE_RATE,
+    _WIDTH,
+    _HEIGHT,
+    _FPS,
+    _PIPE_WIDTH,
+    _CAPACITY,
+    _POOL_SIZE,
+    _BIRD_Y,
+    _BIRD_VELOCITY,
+    _CURRENT_SPEED,
+    _FRAMES_ELAPSED,
+    _SCORE,
+    _PIPE_HEAD,
+    _PIPE_COUNT,
+    _NEXT_PIPE,
+    _HEIGHT_IDX,
+    _STATE_BIRD_Y,
+    _STATE_BIRD_VELOCITY,
+    _STATE_NEXT_PIPE_X,
+    _STATE_NEXT_PIPE_TOP,
+    _STATE_NEXT_PIPE_BOTTOM,
+) = range(len(_LAYOUT))
+
+# Results of the step core
+_ALIVE, _DEAD, _ALIVE_NEEDS_HEIGHTS = range(3)
+
+HEIGHT_POOL_SIZE = 1024
+
+
+@njit(cache=True, fastmath=True)
+def _step_core(action, world):
+    """
+    One game step, compiled with Numba when it is installed (game_core.pyx
+    is the Cython build of the same function). Updates the world array (see
+    _LAYOUT) in place: moves the bird and pipes, scores, tracks the next pipe,
+    culls and spawns pipes, and writes the state returned by get_state().
+    Returns: _DEAD, _ALIVE, or _ALIVE_NEEDS_HEIGHTS once the last pooled pipe
+    height has been used
+    """
+    bird_x = world[_BIRD_X]
+    pipe_gap = world[_PIPE_GAP]
+    width = world[_WIDTH]
+    pipe_width = world[_PIPE_WIDTH]
+    capacity = int(world[_CAPACITY])
+    xs = len(_LAYOUT)  # Start of the pipe x ring buffer
+    tops = xs + capacity
+    passed = tops + capacity
+    pool = passed + capacity
+
+    # Process action and update bird
+    bird_velocity = world[_BIRD_VELOCITY]
+    if action == 1:
+        bird_velocity = world[_JUMP_STRENGTH]
+    bird_velocity += world[_GRAVITY]
+    bird_y = world[_BIRD_Y] + bird_velocity
+    world[_BIRD_Y] = bird_y
+    world[_BIRD_VELOCITY] = bird_velocity
+
+    # Increase frame counter and update speed based on time
+    frames_elapsed = world[_FRAMES_ELAPSED] + 1
+    world[_FRAMES_ELAPSED] = frames_elapsed
+    current_speed = world[_BASE_SPEED] + (
+        frames_elapsed / world[_FPS] * world[_SPEED_INCREASE_RATE]
+    )
+    world[_CURRENT_SPEED] = current_speed
+
+    # Bird bounding box, shifted so each pipe test is a plain compare
+    r = world[_BIRD_SIZE] / 2
+    min_x = bird_x - r - pipe_width
+    max_x = bird_x + r
+    min_top = bird_y - r
+    max_top = bird_y + r - pipe_gap
+
+    # Update pipes
+    head = int(world[_PIPE_HEAD])
+    count = int(world[_PIPE_COUNT])
+    score = world[_SCORE]
+    dead = False
+    for k in range(count):
+        i = head + k
+        if i >= capacity:
+            i -= capacity
+        x = world[xs + i] - current_speed
+        world[xs + i] = x
+        top = world[tops + i]
+
+        # Check collision (bitwise ops so there are no short-circuit branches)
+        if (min_x < x) & (x < max_x) & ((min_top < top) | (top < max_top)):
+            dead = True
+            break
+
+        # Check if passed pipe
+        if world[passed + i] == 0 and x + pipe_width < bird_x:
+            world[passed + i] = 1
+            score += 1
+    world[_SCORE] = score
+
+    # Check boundaries
+    if bird_y > world[_HEIGHT] or bird_y < 0:
+        dead = True
+
+    # Advance past pipes the bird has cleared (x only ever decreases)
+    next_pipe = int(world[_NEXT_PIPE])
+    while (
+        next_pipe < count
+        and world[xs + (head + next_pipe) % capacity] + pipe_width <= bird_x
+    ):
+        next_pipe += 1
+
+    result = _DEAD if dead else _ALIVE
+    if not dead:
+        # Remove off-screen pipes (pipes are ordered, so only the first can leave)
+        while count and world[xs + head] + pipe_width < 0:
+            head = (head + 1) % capacity
+            count -= 1
+            next_pipe -= 1
 
-    def collides_with(self, bird):
-        bird_rect = bird.get_rect()
-        top_pipe = pygame.Rect(self.x, 0, self.width, self.top_height)
-        bottom_pipe = pygame.Rect(
-            self.x,
-            self.top_height + self.gap,
-            self.width,
-            HEIGHT - self.top_height - self.gap,
+        # Add new pipes
+        if count == 0 or world[xs + (head + count - 1) % capacity] < (
+            width - world[_PIPE_DISTANCE]
+        ):
+            if count == capacity:
+                raise RuntimeError("pipe ring buffer is full")
+            i = (head + count) % capacity
+            height_idx = int(world[_HEIGHT_IDX])
+            world[xs + i] = width
+            world[tops + i] = world[pool + height_idx]
+            world[passed + i] = 0
+            count += 1
+            world[_HEIGHT_IDX] = height_idx + 1
+            if height_idx + 1 == int(world[_POOL_SIZE]):
+                result = _ALIVE_NEEDS_HEIGHTS
+
+    world[_PIPE_HEAD] = head
+    world[_PIPE_COUNT] = count
+    world[_NEXT_PIPE] = next_pipe
+
+    world[_STATE_BIRD_Y] = bird_y
+    world[_STATE_BIRD_VELOCITY] = bird_velocity
+    if next_pipe < count:
+        i = (head + next_pipe) % capacity
+        top = world[tops + i]
+        world[_STATE_NEXT_PIPE_X] = world[xs + i] - bird_x
+        world[_STATE_NEXT_PIPE_TOP] = top
+        world[_STATE_NEXT_PIPE_BOTTOM] = top + pipe_gap
+    else:
+        world[_STATE_NEXT_PIPE_X] = width
+        world[_STATE_NEXT_PIPE_TOP] = world[_HEIGHT] // 2
+        world[_STATE_NEXT_PIPE_BOTTOM] = world[_HEIGHT]
+    return result
+
+
+try:
+    # Prefer the Cython build of the physics when it has been compiled
+    import game_core
+except ImportError:
+    pass
+else:
+    # A build of an older game_core.pyx would misread the world array
+    if getattr(game_core, "LAYOUT", None) == _LAYOUT:
+        _step_core = game_core.step_core
+    else:
+        warnings.warn(
+            "game_core is out of date and is ignored, rebuild it with "
+            "python setup.py build_ext --inplace"
         )
-        return bird_rect.colliderect(top_pipe) or bird_rect.colliderect(bottom_pipe)
-
-    def off_screen(self):
-        return self.x + self.width < 0
 
 
 class FlappyBirdGame:
-    def __init__(self, pipe_distance=300, pipe_gap=200, speed_increase_rate=0.0):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Flappy Bird - Q-Learning")
-        self.clock = pygame.time.Clock()
+    def __init__(
+        self,
+        pipe_distance=300,
+        pipe_gap=200,
+        speed_increase_rate=0.0,
+        headless=False,
+        seed=None,
+    ):
+        if pipe_distance <= 0:
+            raise ValueError("pipe_distance must be positive")
+        self.headless = headless  # Skip pygame/SDL entirely (for training)
+        self._render_queue = None  # Set by start_async_render()
+        if not headless:
+            self._init_display()
         self.pipe_distance = pipe_distance  # Distance between pipes
         self.pipe_gap = pipe_gap  # Height of gap in pipes
         self.speed_increase_rate = (
             speed_increase_rate  # Speed increase per second (0 = no increase)
         )
         self.base_speed = 3  # Starting pipe speed
+
+        # All game state lives in one array (see _LAYOUT). The pipes are fixed
+        # size ring buffers, pipe_count pipes ordered left to right from slot
+        # pipe_head, exposed as views
+        capacity = _max_pipes(pipe_distance)
+        xs = len(_LAYOUT)
+        self._world = np.zeros(xs + 3 * capacity + HEIGHT_POOL_SIZE)
+        self.pipe_x = self._world[xs : xs + capacity]
+        self.pipe_top = self._world[xs + capacity : xs + 2 * capacity]
+        self.pipe_passed = self._world[xs + 2 * capacity : xs + 3 * capacity]
+        self._height_pool = self._world[xs + 3 * capacity :]
+        self._state = self._world[_STATE_BIRD_Y : _STATE_NEXT_PIPE_BOTTOM + 1]
+
+        # Pipe heights are drawn in batches, a seed makes runs reproducible
+        self._rng = np.random.default_rng(seed)
+        self._refill_heights()
         self.reset()
 
+    def _init_display(self):
+        """Open the window and build everything render() reuses every frame"""
+        # Let SDL batch draw calls (read when the display initializes)
+        os.environ.setdefault("SDL_RENDER_BATCHING", "1")
+
+        # Initialize Pygame
+        pygame.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Flappy Bird - Q-Learning")
+
+        # Only QUIT, key presses and exposes (which need a full redraw) are
+        # handled, drop everything else in SDL
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.WINDOWEXPOSED])
+
+        # Static background, painted once; each frame only restores the
+        # areas that were drawn over in the previous frame
+        self._background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._background.fill(BLUE)
+        self.screen.blit(self._background, (0, 0))
+        pygame.display.flip()
+        self._drawn_rects = []
+        self._full_redraw = False
+
+        # One full-height pipe column, pipes blit the part they need
+        self._pipe_surface = pygame.Surface((PIPE_WIDTH, HEIGHT)).convert()
+        self._pipe_surface.fill(GREEN)
+
+        # Fonts and static text are built once, not every frame
+        self._font_small = pygame.font.Font(None, 36)
+        self._font_big = pygame.font.Font(None, 48)
+        self._score_cache = (-1, None)  # (score, rendered text)
+        self._final_score_cache = (-1, None, None)  # (score, text, rect)
+        self._game_over_text = self._font_big.render(
+            "Game Over! Press SPACE", True, (255, 0, 0)
+        )
+        self._game_over_rect = self._game_over_text.get_rect(
+            center=(WIDTH // 2, HEIGHT // 2 - 40)
+        )
+
     def reset(self):
         """Reset the game to initial state"""
-        self.bird = Bird()
-        self.pipes = [Pipe(WIDTH + 200, self.pipe_gap)]
-        self.pipes[0].speed = self.base_speed
-        self.score = 0
+        world = self._world
+        world[_BIRD_X] = Bird.x
+        world[_BIRD_SIZE] = Bird.size
+        world[_GRAVITY] = Bird.gravity
+        world[_JUMP_STRENGTH] = Bird.jump_strength
+        world[_PIPE_GAP] = self.pipe_gap
+        world[_PIPE_DISTANCE] = self.pipe_distance
+        world[_BASE_SPEED] = self.base_speed
+        world[_SPEED_INCREASE_RATE] = self.speed_increase_rate
+        world[_WIDTH] = WIDTH
+        world[_HEIGHT] = HEIGHT
+        world[_FPS] = FPS
+        world[_PIPE_WIDTH] = PIPE_WIDTH
+        world[_CAPACITY] = len(self.pipe_x)
+        world[_POOL_SIZE] = len(self._height_pool)
+
+        self.bird = Bird(world[_BIRD_Y : _BIRD_VELOCITY + 1])
+        world[_CURRENT_SPEED] = self.base_speed
+        world[_FRAMES_ELAPSED] = 0  # Track time
+        world[_SCORE] = 0
+        world[_PIPE_HEAD] = 0
+        world[_PIPE_COUNT] = 0
+        world[_NEXT_PIPE] = 0  # Position of the first pipe ahead of the bird
+        top_height = self._next_height()
+        self._add_pipe(WIDTH + 200, top_height)
         self.game_over = False
-        self.current_speed = self.base_speed
-        self.frames_elapsed = 0  # Track time
-        return self.get_state()
+
+        self._state[:] = (
+            self.bird.y,
+            self.bird.velocity,
+            WIDTH + 200 - Bird.x,
+            top_height,
+            top_height + self.pipe_gap,
+        )
+        return self._state
+
+    @property
+    def score(self):
+        return int(self._world[_SCORE])
+
+    @property
+    def frames_elapsed(self):
+        return int(self._world[_FRAMES_ELAPSED])
+
+    @property
+    def current_speed(self):
+        return float(self._world[_CURRENT_SPEED])
+
+    def _refill_heights(self):
+        """Draw a new pool of random top pipe heights"""
+        self._height_pool[:] = self._rng.integers(
+            100, HEIGHT - self.pipe_gap - 100, len(self._height_pool), endpoint=True
+        )
+        self._world[_HEIGHT_IDX] = 0
+
+    def _next_height(self):
+        """Next random top pipe height from the pool"""
+        world = self._world
+        height_idx = int(world[_HEIGHT_IDX])
+        height = self._height_pool[height_idx]
+        world[_HEIGHT_IDX] = height_idx + 1
+        if height_idx + 1 == len(self._height_pool):
+            self._refill_heights()
+        return height
+
+    def _add_pipe(self, x, top_height):
+        world = self._world
+        count = int(world[_PIPE_COUNT])
+        # Pipes are spaced more than pipe_distance apart, which bounds how
+        # many fit (see _max_pipes)
+        if count == len(self.pipe_x):
+            raise RuntimeError("pipe ring buffer is full")
+        slot = (int(world[_PIPE_HEAD]) + count) % len(self.pipe_x)
+        self.pipe_x[slot] = x
+        self.pipe_top[slot] = top_height
+        self.pipe_passed[slot] = 0
+        world[_PIPE_COUNT] = count + 1
+
+    def _live_pipes(self):
+        """Copies of the x and top height arrays of the live pipes, in order"""
+        head = int(self._world[_PIPE_HEAD])
+        count = int(self._world[_PIPE_COUNT])
+        slots = (head + np.arange(count)) % len(self.pipe_x)
+        return self.pipe_x[slots], self.pipe_top[slots]
 
     def get_state(self):
         """
         Return the current game state for Q-learning.
-        Returns a tuple of relevant features:
+        Returns a float64 array of relevant features:
         - bird_y: Bird's y position
         - bird_velocity: Bird's velocity
         - next_pipe_x: Horizontal distance to next pipe
         - next_pipe_top: Height of top pipe opening
         - next_pipe_bottom: Height of bottom pipe opening
+        The array is part of the game's world array, written by reset() and
+        each step(), copy it to keep it.
         """
-        # Find the next pipe ahead of the bird
-        next_pipe = None
-        for pipe in self.pipes:
-            if pipe.x + pipe.width > self.bird.x:
-                next_pipe = pipe
-                break
-
-        if next_pipe:
-            return (
-                self.bird.y,
-                self.bird.velocity,
-                next_pipe.x - self.bird.x,
-                next_pipe.top_height,
-                next_pipe.top_height + next_pipe.gap,
-            )
-        else:
-            return (self.bird.y, self.bird.velocity, WIDTH, HEIGHT // 2, HEIGHT)
+        return self._state
+
+    def get_state_bytes(self):
+        """Current state as bytes, a cheap hashable key for tabular Q-learning"""
+        return self.get_state().tobytes()
 
     def step(self, action):
         """
         Execute one game step with the given action.
         action: 0 = do nothing, 1 = jump
         Returns: (next_state, reward, done)
+        Check done first: when it is True, next_state is a shared all-zero
+        placeholder, not the real final state.
         """
-        # Process action
-        if action == 1:
-            self.bird.jump()
-
-        # Update bird
-        self.bird.update()
-
-        # Increase frame counter and update speed based on time
-        self.frames_elapsed += 1
-        seconds_elapsed = self.frames_elapsed / FPS
-        self.current_speed = self.base_speed + (
-            seconds_elapsed * self.speed_increase_rate
-        )
-
-        # Update pipes
-        for pipe in self.pipes:
-            pipe.speed = self.current_speed
-            pipe.update()
-
-            # Check collision
-            if pipe.collides_with(self.bird):
-                self.game_over = True
-                return self.get_state(), -1000, True
-
-            # Check if passed pipe
-            if not pipe.passed and pipe.x + pipe.width < self.bird.x:
-                pipe.passed = True
-                self.score += 1
-
-        # Remove off-screen pipes
-        self.pipes = [p for p in self.pipes if not p.off_screen()]
-
-        # Add new pipes
-        if len(self.pipes) == 0 or self.pipes[-1].x < WIDTH - self.pipe_distance:
-            new_pipe = Pipe(WIDTH, self.pipe_gap)
-            new_pipe.speed = self.current_speed
-            self.pipes.append(new_pipe)
-
-        # Check boundaries
-        if self.bird.y > HEIGHT or self.bird.y < 0:
+        result = _step_core(action, self._world)
+        if result == _DEAD:
             self.game_over = True
-            return self.get_state(), -1000, True
+            return _TERMINAL_STATE, -1000, True
+        if result == _ALIVE_NEEDS_HEIGHTS:
+            self._refill_heights()
 
         # Small reward for staying alive
-        reward = 1
-
-        return self.get_state(), reward, False
+        return self._state, 1, False
 
     def render(self, show_game_over=False):
-        """Render the game (optional, for visualization)"""
-        self.screen.fill(BLUE)
-
-        # Draw pipes
-        for pipe in self.pipes:
-            pipe.draw(self.screen)
+        """
+        Render the game (optional, for visualization, no-op when headless).
+        Does not wait for the next frame, so it never slows down training.
+        After start_async_render() this only hands a snapshot to the render
+        thread, dropping the frame if that thread is still busy.
+        """
+        # Read once, the render thread clears it when its window is closed
+        render_queue = self._render_queue
+        if render_queue is not None:
+            snapshot = (self.bird.y, *self._live_pipes(), self.score, show_game_over)
+            try:
+                render_queue.put(snapshot, block=False)
+            except queue.Full:
+                pass  # Render thread is still busy, drop this frame
+            return
+
+        if self.headless:
+            return
+
+        self._draw_frame(self.bird, *self._live_pipes(), self.score, show_game_over)
+
+    def _redraw_all(self):
+        """Repaint the whole background and flip the next frame in full"""
+        self.screen.blit(self._background, (0, 0))
+        self._drawn_rects = []
+        self._full_redraw = True
+
+    def _draw_frame(self, bird, pipe_x, pipe_top, score, show_game_over):
+        screen = self.screen
+
+        # Erase last frame's sprites
+        background = self._background
+        screen.blits([(background, rect, rect) for rect in self._drawn_rects], False)
+        drawn = []
+
+        # Draw pipes, all with a single blits() call
+        pipe_surface = self._pipe_surface
+        pipe_blits = []
+        for x, top in zip(pipe_x.tolist(), pipe_top.tolist()):
+            bottom = top + self.pipe_gap
+            pipe_blits.append((pipe_surface, (x, 0), (0, 0, PIPE_WIDTH, top)))
+            pipe_blits.append(
+                (pipe_surface, (x, bottom), (0, 0, PIPE_WIDTH, HEIGHT - bottom))
+            )
+        drawn.extend(screen.blits(pipe_blits))
 
         # Draw bird
-        self.bird.draw(self.screen)
+        drawn.append(bird.draw(screen))
 
-        # Draw score
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+        # Draw score (only re-rendered when it changes)
+        if self._score_cache[0] != score:
+            score_text = self._font_small.render(f"Score: {score}", True, WHITE)
+            self._score_cache = (score, score_text)
+        drawn.append(screen.blit(self._score_cache[1], (10, 10)))
 
         # Draw game over text if needed
         if show_game_over:
-            font = pygame.font.Font(None, 48)
-
-            text = font.render("Game Over! Press SPACE", True, (255, 0, 0))
-            text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40))
-            self.screen.blit(text, text_rect)
+            drawn.append(screen.blit(self._game_over_text, self._game_over_rect))
+
+            if self._final_score_cache[0] != score:
+                score_text = self._font_big.render(
+                    f"Final Score: {score}", True, (255, 0, 0)
+                )
+                score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
+                self._final_score_cache = (score, score_text, score_rect)
+            drawn.append(
+                screen.blit(self._final_score_cache[1], self._final_score_cache[2])
+            )
 
-            score_text = font.render(f"Final Score: {self.score}", True, (255, 0, 0))
-            score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
-            self.screen.blit(score_text, score_rect)
+        # Only push the areas that changed (old and new positions) to the
+        # display, unless the window was exposed and needs everything again
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            pygame.display.update(self._drawn_rects + drawn)
+        self._drawn_rects = drawn
 
-        pygame.display.flip()
-        self.clock.tick(FPS)
+    def start_async_render(self):
+        """
+        Render on a background thread so training never waits for drawing.
+        Only for headless games: the window is created by the render thread,
+        which must own every SDL call (not supported on macOS, where windows
+        have to live on the main thread).
+        """
+        if not self.headless:
+            raise RuntimeError("start_async_render needs a game created headless")
+        if self._render_queue is not None:
+            raise RuntimeError("async rendering is already running")
+
+        self._render_queue = queue.Queue(maxsize=2)
+        threading.Thread(
+            target=self._render_loop, args=(self._render_queue,), daemon=True
+        ).start()
+
+    def _render_loop(self, render_queue):
+        self._init_display()
+        bird = Bird()
+        snapshot = None
+
+        while True:
+            # Keep the window responsive even when no snapshot arrives
+            exposed = False
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self._render_queue = None
+                    pygame.display.quit()
+                    return
+                if event.type == pygame.WINDOWEXPOSED:
+                    exposed = True
+
+            try:
+                snapshot = render_queue.get(timeout=1 / FPS)
+            except queue.Empty:
+                if not exposed:
+                    continue
+            if exposed:
+                self._redraw_all()
+            if snapshot is None:  # Nothing to draw yet, show the background
+                pygame.display.flip()
+                continue
+            bird.y, pipe_x, pipe_top, score, show_game_over = snapshot
+            self._draw_frame(bird, pipe_x, pipe_top, score, show_game_over)
 
     def play_human(self):
         """Play manually (for testing)"""
+        if self.headless:
+            raise RuntimeError(
+                "play_human needs a window, create the game with headless=False"
+            )
+
+        # Fixed time step: render() never blocks, the loop paces itself
+        frame_time = 1 / FPS
+        next_frame = time.monotonic()
+
         running = True
         while running:
             action = 0  # Default: no jump
 
-            for event in pygame.event.get():
+            for event in pygame.event.get(
+                [pygame.QUIT, pygame.KEYDOWN, pygame.WINDOWEXPOSED]
+            ):
                 if event.type == pygame.QUIT:
                     running = False
                     break
+                if event.type == pygame.WINDOWEXPOSED:
+                    self._redraw_all()  # Repainted by render() below
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
                         if self.game_over:
@@ -243,10 +660,182 @@ class FlappyBirdGame:
 
             self.render(show_game_over=self.game_over)
 
+            # Wait for the next frame
+            next_frame += frame_time
+            sleep_for = next_frame - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            else:
+                next_frame = time.monotonic()  # Fell behind, don't try to catch up
+
         pygame.quit()
         sys.exit()
 
 
+class VectorFlappyBirdGame:
+    """
+    n_envs headless games stepped in lockstep with NumPy, for batched
+    Q-learning rollouts. Every per-game value is an array with one row per
+    game, finished games are reset automatically.
+    """
+
+    def __init__(
+        self,
+        n_envs,
+        pipe_distance=300,
+        pipe_gap=200,
+        speed_increase_rate=0.0,
+        seed=None,
+    ):
+        if pipe_distance <= 0:
+            raise ValueError("pipe_distance must be positive")
+        self.n_envs = n_envs
+        self.pipe_distance = pipe_distance
+        self.pipe_gap = pipe_gap
+        self.speed_increase_rate = speed_increase_rate
+        self.base_speed = 3
+        self._rng = np.random.default_rng(seed)
+
+        bird = Bird()
+        self.bird_x = bird.x
+        self.bird_size = bird.size
+        self.gravity = bird.gravity
+        self.jump_strength = bird.jump_strength
+
+        # Pipe slots are unordered, free slots are marked in pipe_active
+        max_pipes = _max_pipes(pipe_distance)
+
+        self.bird_y = np.empty(n_envs, dtype=np.float32)
+        self.bird_velocity = np.empty(n_envs, dtype=np.float32)
+        self.pipe_x = np.empty((n_envs, max_pipes), dtype=np.float32)
+        self.pipe_top = np.empty((n_envs, max_pipes), dtype=np.float32)
+        self.pipe_passed = np.empty((n_envs, max_pipes), dtype=bool)
+        self.pipe_active = np.empty((n_envs, max_pipes), dtype=bool)
+        self.score = np.empty(n_envs, dtype=np.int64)
+        # Score of each game's last finished episode, kept across the autoreset
+        self.final_scores = np.zeros(n_envs, dtype=np.int64)
+        self.frames_elapsed = np.empty(n_envs, dtype=np.int64)
+        self._last_pipe_x = np.empty(n_envs, dtype=np.float32)  # Newest pipe
+        self._states = np.empty((n_envs, 5), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Reset all games, returns their states"""
+        self._reset_envs(np.ones(self.n_envs, dtype=bool))
+        return self.get_states()
+
+    def _reset_envs(self, envs):
+        """Reset the games selected by the boolean mask envs"""
+        self.bird_y[envs] = HEIGHT // 2
+        self.bird_velocity[envs] = 0
+        self.pipe_passed[envs] = False
+        self.pipe_active[envs] = False
+        self.pipe_x[envs, 0] = WIDTH + 200
+        self.pipe_top[envs, 0] = self._random_top_heights(np.count_nonzero(envs))
+        self.pipe_active[envs, 0] = True
+        self._last_pipe_x[envs] = WIDTH + 200
+        self.score[envs] = 0
+        self.frames_elapsed[envs] = 0
+
+    def _random_top_heights(self, n):
+        return self._rng.integers(100, HEIGHT - self.pipe_gap - 100, n, endpoint=True)
+
+    def get_states(self):
+        """
+        Return the state of every game as an (n_envs, 5) float32 array, with
+        the same features as FlappyBirdGame.get_state().
+        The same array is overwritten on every call, copy it to keep it.
+        """
+        states = self._states
+        states[:, 0] = self.bird_y
+        states[:, 1] = self.bird_velocity
+
+        # Nearest pipe ahead of the bird
+        ahead = self.pipe_active & (self.pipe_x + PIPE_WIDTH > self.bird_x)
+        i = np.where(ahead, self.pipe_x, np.inf).argmin(axis=1)
+        rows = np.arange(self.n_envs)
+        has_pipe = ahead.any(axis=1)
+        next_x = self.pipe_x[rows, i]
+        next_top = self.pipe_top[rows, i]
+
+        states[:, 2] = np.where(has_pipe, next_x - self.bird_x, WIDTH)
+        states[:, 3] = np.where(has_pipe, next_top, HEIGHT // 2)
+        states[:, 4] = np.where(has_pipe, next_top + self.pipe_gap, HEIGHT)
+        return states
+
+    def step(self, actions):
+        """
+        Execute one step in every game.
+        actions: array of n_envs actions (0 = do nothing, 1 = jump)
+        Returns: (next_states, rewards, dones), one row per game. Finished
+        games are reset, so their next state is the start of a new episode
+        and their score is moved to final_scores.
+        """
+        actions = np.asarray(actions)
+
+        # Update birds
+        self.bird_velocity[actions == 1] = self.jump_strength
+        self.bird_velocity += self.gravity
+        self.bird_y += self.bird_velocity
+
+        # Increase frame counters and update speeds based on time
+        self.frames_elapsed += 1
+        speed = self.base_speed + (self.frames_elapsed / FPS * self.speed_increase_rate)
+
+        # Update pipes
+        self.pipe_x -= speed[:, None]
+        self._last_pipe_x -= speed
+
+        # Check collisions for every pipe of every game at once
+        r = self.bird_size / 2
+        min_top = (self.bird_y - r)[:, None]
+        max_top = (self.bird_y + r - self.pipe_gap)[:, None]
+        hit = (
+            self.pipe_active
+            & (self.pipe_x > self.bird_x - r - PIPE_WIDTH)
+            & (self.pipe_x < self.bird_x + r)
+            & ((min_top < self.pipe_top) | (self.pipe_top < max_top))
+        )
+
+        # Check boundaries
+        dones = hit.any(axis=1) | (self.bird_y > HEIGHT) | (self.bird_y < 0)
+        rewards = np.where(dones, -1000, 1)
+
+        # Check if passed pipes
+        # (a pipe the bird hits this step does not count, like FlappyBirdGame)
+        newly_passed = (
+            self.pipe_active
+            & ~self.pipe_passed
+            & ~hit
+            & (self.pipe_x + PIPE_WIDTH < self.bird_x)
+        )
+        self.pipe_passed |= newly_passed
+        self.score += newly_passed.sum(axis=1)
+
+        # Remove off-screen pipes
+        self.pipe_active &= self.pipe_x + PIPE_WIDTH >= 0
+
+        # Add new pipes into a free slot
+        spawn = ~dones & (
+            ~self.pipe_active.any(axis=1)
+            | (self._last_pipe_x < WIDTH - self.pipe_distance)
+        )
+        if spawn.any():
+            envs = np.flatnonzero(spawn)
+            slots = self.pipe_active[envs].argmin(axis=1)
+            self.pipe_x[envs, slots] = WIDTH
+            self.pipe_top[envs, slots] = self._random_top_heights(len(envs))
+            self.pipe_passed[envs, slots] = False
+            self.pipe_active[envs, slots] = True
+            self._last_pipe_x[envs] = WIDTH
+
+        if dones.any():
+            self.final_scores[dones] = self.score[dones]
+            self._reset_envs(dones)
+
+        return self.get_states(), rewards, dones
+
+
 # Example usage
 if __name__ == "__main__":
     # Create game with custom settings
@@ -262,13 +851,20 @@ if __name__ == "__main__":
     game.play_human()
 
     # For Q-learning, you would use something like:
-    # state = game.reset()
+    # game = FlappyBirdGame(headless=True, seed=0)  # No window, reproducible
+    # state = game.reset().copy()  # States share one buffer, copy to keep them
     # while True:
     #     action = your_q_learning_agent.choose_action(state)
     #     next_state, reward, done = game.step(action)
+    #     next_state = next_state.copy()  # Or game.get_state_bytes() as a dict key
     #     your_q_learning_agent.learn(state, action, reward, next_state, done)
     #     if done:
-    #         state = game.reset()
+    #         state = game.reset().copy()
     #     else:
     #         state = next_state
-    #     game.render()  # Optional: visualize training
+    #     game.render()  # Optional: visualize training (requires headless=False)
+
+    # Or step many games at once:
+    # games = VectorFlappyBirdGame(n_envs=1024)
+    # states = games.reset()
+    # next_states, rewards, dones = games.step(actions)  # One action per game
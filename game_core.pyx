@@ -0,0 +1,199 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython build of the game physics. When compiled it replaces _step_core in
+game.py. Building needs Cython (pip install Cython), then run:
+python setup.py build_ext --inplace
+"""
+
+# Fields at the start of the world array. game.py only uses this module when
+# LAYOUT matches its own _LAYOUT, keep the enum below in the same order
+LAYOUT = (
+    "bird_x",
+    "bird_size",
+    "gravity",
+    "jump_strength",
+    "pipe_gap",
+    "pipe_distance",
+    "base_speed",
+    "speed_increase_rate",
+    "width",
+    "height",
+    "fps",
+    "pipe_width",
+    "capacity",
+    "pool_size",
+    "bird_y",
+    "bird_velocity",
+    "current_speed",
+    "frames_elapsed",
+    "score",
+    "pipe_head",
+    "pipe_count",
+    "next_pipe",
+    "height_idx",
+    "state_bird_y",
+    "state_bird_velocity",
+    "state_next_pipe_x",
+    "state_next_pipe_top",
+    "state_next_pipe_bottom",
+)
+
+cdef enum:
+    BIRD_X
+    BIRD_SIZE
+    GRAVITY
+    JUMP_STRENGTH
+    PIPE_GAP
+    PIPE_DISTANCE
+    BASE_SPEED
+    SPEED_INCREASE_RATE
+    WIDTH
+    HEIGHT
+    FPS
+    PIPE_WIDTH
+    CAPACITY
+    POOL_SIZE
+    BIRD_Y
+    BIRD_VELOCITY
+    CURRENT_SPEED
+    FRAMES_ELAPSED
+    SCORE
+    PIPE_HEAD
+    PIPE_COUNT
+    NEXT_PIPE
+    HEIGHT_IDX
+    STATE_BIRD_Y
+    STATE_BIRD_VELOCITY
+    STATE_NEXT_PIPE_X
+    STATE_NEXT_PIPE_TOP
+    STATE_NEXT_PIPE_BOTTOM
+    HEADER_SIZE
+
+assert len(LAYOUT) == HEADER_SIZE
+# Results, same as game._ALIVE, game._DEAD and game._ALIVE_NEEDS_HEIGHTS
+cdef enum:
+    ALIVE
+    DEAD
+    ALIVE_NEEDS_HEIGHTS
+
+
+cpdef int step_core(int action, double[::1] world) except -1:
+    """
+    One game step, same arguments and result as game._step_core (the world
+    array is updated in place).
+    """
+    cdef double bird_x = world[BIRD_X]
+    cdef double pipe_gap = world[PIPE_GAP]
+    cdef double width = world[WIDTH]
+    cdef double pipe_width = world[PIPE_WIDTH]
+    cdef Py_ssize_t capacity = <Py_ssize_t>world[CAPACITY]
+    cdef Py_ssize_t xs = HEADER_SIZE  # Start of the pipe x ring buffer
+    cdef Py_ssize_t tops = xs + capacity
+    cdef Py_ssize_t passed = tops + capacity
+    cdef Py_ssize_t pool = passed + capacity
+    cdef double bird_y, bird_velocity, frames_elapsed, current_speed, score
+    cdef double r, min_x, max_x, min_top, max_top, x, top
+    cdef Py_ssize_t head, count, next_pipe, height_idx, i, k
+    cdef bint dead = False
+    cdef int result
+
+    # Process action and update bird
+    bird_velocity = world[BIRD_VELOCITY]
+    if action == 1:
+        bird_velocity = world[JUMP_STRENGTH]
+    bird_velocity += world[GRAVITY]
+    bird_y = world[BIRD_Y] + bird_velocity
+    world[BIRD_Y] = bird_y
+    world[BIRD_VELOCITY] = bird_velocity
+
+    # Increase frame counter and update speed based on time
+    frames_elapsed = world[FRAMES_ELAPSED] + 1
+    world[FRAMES_ELAPSED] = frames_elapsed
+    current_speed = world[BASE_SPEED] + (
+        frames_elapsed / world[FPS] * world[SPEED_INCREASE_RATE]
+    )
+    world[CURRENT_SPEED] = current_speed
+
+    # Bird bounding box, shifted so each pipe test is a plain compare
+    r = world[BIRD_SIZE] / 2
+    min_x = bird_x - r - pipe_width
+    max_x = bird_x + r
+    min_top = bird_y - r
+    max_top = bird_y + r - pipe_gap
+
+    # Update pipes
+    head = <Py_ssize_t>world[PIPE_HEAD]
+    count = <Py_ssize_t>world[PIPE_COUNT]
+    score = world[SCORE]
+    for k in range(count):
+        i = head + k
+        if i >= capacity:
+            i -= capacity
+        x = world[xs + i] - current_speed
+        world[xs + i] = x
+        top = world[tops + i]
+
+        # Check collision
+        if (min_x < x) & (x < max_x) & ((min_top < top) | (top < max_top)):
+            dead = True
+            break
+
+        # Check if passed pipe
+        if world[passed + i] == 0 and x + pipe_width < bird_x:
+            world[passed + i] = 1
+            score += 1
+    world[SCORE] = score
+
+    # Check boundaries
+    if bird_y > world[HEIGHT] or bird_y < 0:
+        dead = True
+
+    # Advance past pipes the bird has cleared (x only ever decreases)
+    next_pipe = <Py_ssize_t>world[NEXT_PIPE]
+    while (
+        next_pipe < count
+        and world[xs + (head + next_pipe) % capacity] + pipe_width <= bird_x
+    ):
+        next_pipe += 1
+
+    result = DEAD if dead else ALIVE
+    if not dead:
+        # Remove off-screen pipes (pipes are ordered, so only the first can leave)
+        while count and world[xs + head] + pipe_width < 0:
+            head = (head + 1) % capacity
+            count -= 1
+            next_pipe -= 1
+
+        # Add new pipes
+        if count == 0 or world[xs + (head + count - 1) % capacity] < (
+            width - world[PIPE_DISTANCE]
+        ):
+            if count == capacity:
+                raise RuntimeError("pipe ring buffer is full")
+            i = (head + count) % capacity
+            height_idx = <Py_ssize_t>world[HEIGHT_IDX]
+            world[xs + i] = width
+            world[tops + i] = world[pool + height_idx]
+            world[passed + i] = 0
+            count += 1
+            world[HEIGHT_IDX] = height_idx + 1
+            if height_idx + 1 == <Py_ssize_t>world[POOL_SIZE]:
+                result = ALIVE_NEEDS_HEIGHTS
+
+    world[PIPE_HEAD] = head
+    world[PIPE_COUNT] = count
+    world[NEXT_PIPE] = next_pipe
+
+    world[STATE_BIRD_Y] = bird_y
+    world[STATE_BIRD_VELOCITY] = bird_velocity
+    if next_pipe < count:
+        i = (head + next_pipe) % capacity
+        top = world[tops + i]
+        world[STATE_NEXT_PIPE_X] = world[xs + i] - bird_x
+        world[STATE_NEXT_PIPE_TOP] = top
+        world[STATE_NEXT_PIPE_BOTTOM] = top + pipe_gap
+    else:
+        world[STATE_NEXT_PIPE_X] = width
+        world[STATE_NEXT_PIPE_TOP] = world[HEIGHT] // 2
+        world[STATE_NEXT_PIPE_BOTTOM] = world[HEIGHT]
+    return result
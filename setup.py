@@ -0,0 +1,9 @@
+# Builds the optional Cython physics core, needs Cython (pip install Cython):
+# python setup.py build_ext --inplace
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="flappybird",
+    ext_modules=cythonize("game_core.pyx"),
+)